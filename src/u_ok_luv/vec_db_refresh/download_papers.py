@@ -1,22 +1,100 @@
 import argparse
-import arxiv
 import csv
+import functools
+import gzip
+import itertools
+import json
 import os
-import textwrap
 import requests
-import time
 import re
+import threading
+import time
+import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 from importlib import resources
-from datetime import datetime, timedelta, timezone
+from datetime import date, datetime, timedelta, timezone
 from pathlib import Path
+from typing import Iterable, Iterator
 
 from u_ok_luv.vec_db_refresh.encode_search_terms import read_search_terms
 
+try:
+    # Optional: orjson decodes API pages faster than stdlib json
+    from orjson import loads as _json_loads
+except ImportError:
+    _json_loads = json.loads
+
 PACKAGE = "u_ok_luv.vec_db_refresh.search_terms"
 SAVE_EXT = "csv"
+# --compress choice -> suffix appended to SAVE_EXT
+COMPRESSION_SUFFIXES = {"none": "", "gzip": ".gz", "zstd": ".zst"}
+STATE_FILE = "harvest_state.json"
+# Sources tracked separately in the harvest state, so skipping one doesn't advance it
+SOURCES = ("arxiv", "medrxiv", "epmc")
 STATUS_OK = 200
+CSV_BUFFER_BYTES = 1 << 20
+RETRY_BACKOFF_MAX = 30.0
+FULLTEXT_MAX_CHARS = 2000
+ARXIV_API_URL = "https://export.arxiv.org/api/query"
+ARXIV_PAGE_SIZE = 100
+# Terms OR-ed into one arXiv query; keeps URLs short and failures isolated
+ARXIV_TERMS_PER_QUERY = 15
+# arXiv occasionally returns an empty page inside a result set; retry it this many times
+ARXIV_EMPTY_PAGE_RETRIES = 3
+# arXiv's API terms ask for no more than one request every three seconds
+ARXIV_DELAY_SECONDS = 3.0
+_ATOM_NS = {
+    "atom": "http://www.w3.org/2005/Atom",
+    "arxiv": "http://arxiv.org/schemas/atom",
+    "opensearch": "http://a9.com/-/spec/opensearch/1.1/",
+}
+
+# Every column, in output order; all sources emit each key ("" when unknown)
+FIELDNAMES = [
+    "paper_id",
+    "source",
+    "title",
+    "authors",
+    "published",
+    "chunk_id",
+    "text_chunk",
+    "pdf_url",
+    "abstract",
+    "doi",
+]
+
+_WS_RE = re.compile(r"\s+")
+_SEMI_RE = re.compile(r"\s*;\s*")
+
+
+class _Throttle:
+    """
+    Spaces calls to wait() at least `interval` seconds apart across threads.
+    Each caller reserves the next slot under the lock and sleeps outside it.
+    """
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._next_slot = 0.0
+
+    def wait(self):
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+# Topics run concurrently, so every arXiv request shares one rate budget
+_ARXIV_THROTTLE = _Throttle(ARXIV_DELAY_SECONDS)
+
+# Shared HTTP session used whenever a caller does not pass its own; see _get_session.
+_SESSION: requests.Session | None = None
+_SESSION_LOCK = threading.Lock()
 
 
 def load_all_search_terms(package: str = PACKAGE) -> dict[str, list[str]]:
@@ -33,84 +111,261 @@ def save_collected_data(data: list[dict], csv_path: str):
     """
     Saves data collected from both Arxiv and MedRxiv.
     Ensures cells are single-line (no embedded newlines) for easier CSV consumers.
+    Columns are the fixed FIELDNAMES that every source emits; other keys are ignored.
+    """
+    stream_collected_data(data, csv_path)
+
+
+def _open_csv(path: str | Path, mode: str, suffix: str | None = None):
+    """
+    Opens a CSV file for text I/O, (de)compressing based on `suffix`
+    (defaults to the path's own): ".gz" uses gzip, ".zst" uses zstandard.
     """
-    fieldnames: list[str] = []
-    if data:
-        keys = set()
-        for row in data:
-            keys.update(row.keys())
-        preferred = [
-            "paper_id",
-            "source",
-            "title",
-            "authors",
-            "published",
-            "chunk_id",
-            "text_chunk",
-            "pdf_url",
-            "abstract",
-            "doi",
-        ]
-        fieldnames = [k for k in preferred if k in keys] + [k for k in sorted(keys) if k not in preferred]
+    suffix = Path(path).suffix if suffix is None else suffix
+    if suffix == ".gz":
+        return gzip.open(path, mode=f"{mode}t", newline='', encoding='utf-8')
+    if suffix == ".zst":
+        try:
+            import zstandard
+        except ImportError as e:
+            raise RuntimeError("zstd compression requires the 'zstandard' package") from e
+        return zstandard.open(path, mode=f"{mode}t", newline='', encoding='utf-8')
+    return open(path, mode=mode, newline='', encoding='utf-8', buffering=CSV_BUFFER_BYTES)
+
 
+def read_collected_data(csv_path: str | Path) -> Iterator[dict]:
+    """
+    Reads back rows written by stream_collected_data, one at a time.
+    """
+    with _open_csv(csv_path, 'r') as csv_file:
+        yield from csv.DictReader(csv_file)
+
+
+def _load_harvest_state(path: Path) -> dict[str, dict[str, str]]:
+    """
+    Reads the topic -> source -> last harvest date map. A missing or
+    unreadable file, or any entry that is not an ISO date, counts as no
+    state for that topic and source. Older files keyed by topic alone apply
+    their date to every source.
+    """
+    try:
+        with open(path, encoding='utf-8') as f:
+            raw = json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {}
+    if not isinstance(raw, dict):
+        return {}
+    state: dict[str, dict[str, str]] = {}
+    for doc, sources in raw.items():
+        if not isinstance(sources, dict):
+            sources = dict.fromkeys(SOURCES, sources)
+        for source, value in sources.items():
+            try:
+                state.setdefault(doc, {})[source] = date.fromisoformat(value).isoformat()
+            except (TypeError, ValueError):
+                print(f"Ignoring invalid harvest date for '{doc}' ({source}) in {path}: {value!r}")
+    return state
+
+
+def _save_harvest_state(path: Path, state: dict[str, dict[str, str]]):
+    with open(path, mode='w', encoding='utf-8') as f:
+        json.dump(state, f, indent=2, sort_keys=True)
+
+
+def stream_collected_data(rows: Iterable[dict], csv_path: str, fieldnames: list[str] = FIELDNAMES) -> int:
+    """
+    Writes rows to `csv_path` as they are produced, so callers can pass a
+    generator and never hold a whole topic in memory. The file is written
+    under a temporary name and only replaces `csv_path` once complete.
+    A ".gz" or ".zst" `csv_path` is compressed accordingly.
+    Returns the number of rows written.
+    """
     def _normalize_cell(value) -> str:
         if value is None:
             return ""
         s = str(value)
-        # Use regex to collapse all whitespace (including newlines/tabs) to single spaces
-        s = re.sub(r"\s+", " ", s).strip()
-        return s
-
-    with open(csv_path, mode='w', newline='', encoding='utf-8') as csv_file:
-        writer = csv.DictWriter(csv_file, fieldnames=fieldnames)
-        writer.writeheader()
-        for row in data:
-            # Ensure missing keys are written as empty strings and sanitize values
-            writer.writerow({k: _normalize_cell(row.get(k, "")) for k in fieldnames})
-    print(f"Saved {len(data)} text chunks from papers to '{csv_path}'")
-
-
-def query_arxiv_papers(terms: list[str], max_results: int = 500, wrap_width: int = 500):
-    health_query = " OR ".join(f'{term.lower()}' for term in terms)
-
-    search = arxiv.Search(
-        query=health_query,
-        max_results=max_results,
-        sort_by=arxiv.SortCriterion.SubmittedDate,
-        sort_order=arxiv.SortOrder.Descending
+        # Printable text without double spaces has nothing to collapse:
+        # every other whitespace character is non-printable.
+        if s.isprintable() and "  " not in s:
+            return s.strip()
+        # Collapse all whitespace (including newlines/tabs) to single spaces
+        return _WS_RE.sub(" ", s).strip()
+
+    count = 0
+    part_path = f"{csv_path}.part"
+    try:
+        with _open_csv(part_path, 'w', suffix=Path(csv_path).suffix) as csv_file:
+            writer = csv.writer(csv_file)
+            writer.writerow(fieldnames)
+            # Ensure missing keys are written as empty strings and sanitize values.
+            # Rows go out as plain tuples in fieldnames order, which skips the
+            # per-row dict and key checks csv.DictWriter would otherwise do.
+            for row in rows:
+                writer.writerow(tuple(_normalize_cell(row.get(k, "")) for k in fieldnames))
+                count += 1
+        os.replace(part_path, csv_path)
+    except BaseException:
+        if os.path.exists(part_path):
+            os.remove(part_path)
+        raise
+    print(f"Saved {count} text chunks from papers to '{csv_path}'")
+    return count
+
+
+def query_arxiv_papers(terms: list[str],
+                       max_results: int = 500,
+                       wrap_width: int = 500,
+                       session: requests.Session | None = None,
+                       seen_papers: set[str] | None = None,
+                       submitted_since: date | None = None,
+                       timeout_seconds: float = 15.0) -> Iterator[dict]:
+    """
+    Query the arXiv API directly (newest submissions first) for papers
+    matching any of `terms`, paging ARXIV_PAGE_SIZE results at a time over
+    the shared session, and yield their summaries as chunk rows.
+
+    Terms are split into groups of ARXIV_TERMS_PER_QUERY, one query each, and
+    pages are taken from the groups in turn until `max_results` distinct
+    entries have been fetched; a paper matched by several groups is yielded
+    and counted once. A group whose request fails is dropped without ending
+    the others. Requests stay sequential because arXiv throttles per client.
+    """
+    until = f"{datetime.now(timezone.utc):%Y%m%d}2359"
+    queries = []
+    for i in range(0, len(terms), ARXIV_TERMS_PER_QUERY):
+        query = " OR ".join(term.lower() for term in terms[i:i + ARXIV_TERMS_PER_QUERY])
+        if submitted_since is not None:
+            # Incremental runs only ask arXiv for papers submitted since the last harvest
+            query = f"({query}) AND submittedDate:[{submitted_since:%Y%m%d}0000 TO {until}]"
+        queries.append(query)
+
+    http = session or _get_session()
+    # Next start offset per still-active query
+    offsets = dict.fromkeys(queries, 0)
+    # Entry ids already returned by any group, so overlaps between groups
+    # are skipped even when the caller passes no seen_papers
+    entry_ids: set[str] = set()
+    fetched = 0
+    while offsets and fetched < max_results:
+        for query, start in list(offsets.items()):
+            if fetched >= max_results:
+                break
+            page_size = min(ARXIV_PAGE_SIZE, max_results - fetched)
+            page = _arxiv_fetch_page(http, query, start, page_size, timeout_seconds)
+            retries = 0
+            while page is not None and not page[0] and start < page[1] and retries < ARXIV_EMPTY_PAGE_RETRIES:
+                retries += 1
+                print(f"arXiv returned an empty page at offset {start} of {page[1]}, retrying ({retries}/{ARXIV_EMPTY_PAGE_RETRIES})")
+                page = _arxiv_fetch_page(http, query, start, page_size, timeout_seconds)
+            if page is None or not page[0]:
+                if page is None or start < page[1]:
+                    total = "?" if page is None else page[1]
+                    print(f"arXiv: dropping query group at offset {start} of {total} results: {query[:80]}")
+                del offsets[query]
+                continue
+            entries, total_results = page
+            offsets[query] = start + len(entries)
+            if offsets[query] >= total_results:
+                del offsets[query]
+
+            for entry in entries:
+                if entry["entry_id"] in entry_ids:
+                    continue
+                entry_ids.add(entry["entry_id"])
+                fetched += 1
+                doi = entry["doi"]
+                key = _paper_key(doi, entry["entry_id"])
+                if _already_seen(seen_papers, key):
+                    continue
+                wrapped_summary = _fast_wrap(entry["summary"], wrap_width)
+                _mark_seen(seen_papers, key, wrapped_summary)
+
+                # Per-paper fields are formatted once, not once per chunk
+                paper_id = entry["entry_id"]
+                title = entry["title"]
+                authors = ", ".join(entry["authors"])
+                published = _safe_date_iso(entry["published"])
+                pdf_url = entry["pdf_url"]
+                for i, chunk in enumerate(wrapped_summary):
+                    yield {
+                        "paper_id": paper_id,
+                        "title": title,
+                        "authors": authors,
+                        "published": published,
+                        "source": "arxiv",
+                        "chunk_id": i,
+                        "text_chunk": chunk,
+                        "pdf_url": pdf_url,
+                        "abstract": "",
+                        "doi": doi,
+                    }
+
+
+def _arxiv_fetch_page(
+    http,
+    query: str,
+    start: int,
+    page_size: int,
+    timeout_seconds: float,
+) -> tuple[list[dict], int] | None:
+    params = {
+        "search_query": query,
+        "sortBy": "submittedDate",
+        "sortOrder": "descending",
+        "start": str(start),
+        "max_results": str(page_size),
+    }
+    _ARXIV_THROTTLE.wait()
+    try:
+        resp = http.get(ARXIV_API_URL, params=params, headers={"Accept": "application/atom+xml"}, timeout=timeout_seconds)
+    except Exception as e:
+        print(f"arXiv request error: {e}")
+        return None
+    if resp.status_code != STATUS_OK:
+        print(f"arXiv API request failed with status {resp.status_code}, url {resp.url}")
+        return None
+    try:
+        root = ET.fromstring(resp.content)
+    except ET.ParseError:
+        print("arXiv: failed to parse Atom feed")
+        return None
+    total_results = int(root.findtext("opensearch:totalResults", "0", _ATOM_NS) or 0)
+    entries = [_arxiv_parse_entry(e) for e in root.findall("atom:entry", _ATOM_NS)]
+    # Malformed queries come back as a single entry pointing at /api/errors
+    errors = [e for e in entries if "/api/errors" in e["entry_id"]]
+    if errors:
+        print(f"arXiv API error: {' '.join(errors[0]['summary'].split())}")
+        return None
+    return entries, total_results
+
+
+def _arxiv_parse_entry(entry: ET.Element) -> dict:
+    pdf_url = next(
+        (link.get("href", "") for link in entry.findall("atom:link", _ATOM_NS) if link.get("title") == "pdf"),
+        "",
     )
-    data = []
-    client = arxiv.Client()
-    
-    for result in client.results(search):
-        wrapped_summary = textwrap.wrap(result.summary.strip().replace("\n", " "), width=wrap_width)
-        
-        for i, chunk in enumerate(wrapped_summary):
-            data.append({
-                "paper_id": result.entry_id,
-                "title": result.title,
-                "authors": ", ".join(author.name for author in result.authors),
-                "published": result.published.strftime("%Y-%m-%d"),
-                "source": "arxiv",
-                "chunk_id": i,
-                "text_chunk": chunk,
-                "pdf_url": result.pdf_url
-            })
-    return data
+    return {
+        "entry_id": (entry.findtext("atom:id", "", _ATOM_NS) or "").strip(),
+        "title": " ".join((entry.findtext("atom:title", "", _ATOM_NS) or "").split()),
+        "summary": entry.findtext("atom:summary", "", _ATOM_NS) or "",
+        "authors": [(a.findtext("atom:name", "", _ATOM_NS) or "").strip() for a in entry.findall("atom:author", _ATOM_NS)],
+        "published": (entry.findtext("atom:published", "", _ATOM_NS) or "").strip(),
+        "pdf_url": pdf_url,
+        "doi": (entry.findtext("arxiv:doi", "", _ATOM_NS) or "").strip(),
+    }
 
 
 def query_medrxiv_papers(terms: list[str],
                          server: str = "medrxiv",
                          days_back: int = 7,
                          max_results: int = 500,
-                         page_size: int = 100,
                          base_url: str = "https://api.biorxiv.org",
                          user_agent: str | None = None,
-                         retries: int = 3,
-                         backoff_seconds: float = 1.5,
                          timeout_seconds: float = 15.0,
                          wrap_width: int = 500,
-                         session: requests.Session | None = None):
+                         session: requests.Session | None = None,
+                         seen_papers: set[str] | None = None,
+                         prefetch_pages: int = 4) -> Iterator[dict]:
     """
     Query medRxiv for preprints matching any of the terms in `terms`
     using the API, for the past `days_back` days (or fewer if limited),
@@ -121,45 +376,94 @@ def query_medrxiv_papers(terms: list[str],
         server: "medrxiv" (default) or "biorxiv" etc.
         days_back: how many past days to pull from.
         max_results: cap on number of results to return.
-
-    Returns:
-        A list of dicts with keys roughly: paper_id, title, authors, published,
-        chunk_id, text_chunk, abstract (or summary), doi, etc.
+        seen_papers: paper keys (see _paper_key) already collected; matching
+            items are skipped before chunking, and kept papers are added.
+        prefetch_pages: how many pages to request concurrently. The cursor is
+            a plain offset, so once the first page reports the total, all
+            remaining pages are scheduled up front and processed in order.
+
+    Yields:
+        Dicts with keys roughly: paper_id, title, authors, published,
+        chunk_id, text_chunk, abstract (on chunk 0 only), doi, etc.
     """
     # Prepare filters and date window (YYYY-MM-DD/YYYY-MM-DD per API docs)
+    term_pattern = _compile_terms(terms)
     start, end = _interval_dates(days_back)
     interval = f"{start}/{end}"
 
-    collected = []
-    cursor = 0
+    collected = 0
+    # The API's fixed page size, taken from the first page
+    server_page_size = None
+    http = session or _get_session()
+    headers = _build_headers(user_agent)
 
-    while True:
-        url = _build_medrxiv_url(base_url, server, interval, cursor)
-        headers = _build_headers(user_agent)
-        data = _request_json(session, url, headers, timeout_seconds, retries, backoff_seconds)
+    def fetch_page(page_cursor: int) -> dict | None:
+        url = _build_medrxiv_url(base_url, server, interval, page_cursor)
+        return _request_json(http, url, headers, timeout_seconds)
+
+    for data in _medrxiv_pages(fetch_page, prefetch_pages):
         if data is None:
-            return collected
+            return
 
         items = data.get("collection", [])
         if not items:
-            break
+            return
+        if server_page_size is None:
+            server_page_size = len(items)
 
         for item in items:
-            rows = _process_medrxiv_item(item, terms, wrap_width)
+            # medRxiv lists every version of a preprint under the same DOI
+            key = _paper_key(item.get("doi") or "", "")
+            if _already_seen(seen_papers, key):
+                continue
+            rows = _process_medrxiv_item(item, term_pattern, wrap_width)
+            _mark_seen(seen_papers, key, rows)
             for row in rows:
-                collected.append(row)
-                if len(collected) >= max_results:
+                yield row
+                collected += 1
+                if collected >= max_results:
                     break
-            if len(collected) >= max_results:
+            if collected >= max_results:
                 break
 
         # check if we need to paginate further
-        cursor += len(items)
-        collected_len, len_items = len(collected), len(items)
-        if collected_len >= max_results or len_items < page_size:
-            break
+        if collected >= max_results or len(items) < server_page_size:
+            return
 
-    return collected
+
+def _medrxiv_pages(fetch_page, prefetch_pages: int) -> Iterator[dict | None]:
+    """
+    Yields medRxiv pages in cursor order. The first page reports the total
+    number of records for the interval, so the remaining cursors are known
+    and fetched `prefetch_pages` at a time. If the total is missing, pages are
+    fetched speculatively in waves until the caller stops iterating.
+    Cursors advance by the size of the first page, which is the server's
+    fixed page size. Closing the generator cancels any fetches not yet started.
+    """
+    first = fetch_page(0)
+    yield first
+    if first is None:
+        return
+    step = len(first.get("collection") or [])
+    if not step:
+        return
+    total = _medrxiv_total(first)
+    workers = max(1, prefetch_pages)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        if total is not None:
+            yield from executor.map(fetch_page, range(step, total, step))
+            return
+        cursor = step
+        while True:
+            yield from executor.map(fetch_page, [cursor + k * step for k in range(workers)])
+            cursor += workers * step
+
+
+def _medrxiv_total(data: dict) -> int | None:
+    try:
+        return int((data.get("messages") or [{}])[0]["total"])
+    except (KeyError, IndexError, TypeError, ValueError):
+        return None
 
 
 def _interval_dates(days_back: int) -> tuple[str, str]:
@@ -181,59 +485,84 @@ def _build_headers(user_agent: str | None) -> dict:
 
 
 def _request_json(
-    session: requests.Session | None,
+    session: requests.Session,
     url: str,
     headers: dict,
     timeout_seconds: float,
-    retries: int,
-    backoff_seconds: float,
 ) -> dict | None:
-    attempt = 0
-    http = session or requests
-    while True:
-        resp = http.get(url, headers=headers, timeout=timeout_seconds)
-        if resp.status_code == STATUS_OK:
-            try:
-                return resp.json()
-            except Exception:
-                print(f"Failed to decode JSON from {url}")
-                return None
-        attempt += 1
-        if resp.status_code in (403, 429, 502, 503, 504) and attempt <= retries:
-            sleep_for = backoff_seconds * attempt
-            print(f"medRxiv API status {resp.status_code}; retrying in {sleep_for:.1f}s (attempt {attempt}/{retries})...")
-            time.sleep(sleep_for)
-            continue
-        print(f"medRxiv API request failed with status {resp.status_code}, url {url}")
+    # Transient failures are retried by the session's urllib3 Retry adapter
+    # (see build_session); anything still failing here is final.
+    resp = session.get(url, headers=headers, timeout=timeout_seconds)
+    if resp.status_code == STATUS_OK:
+        try:
+            return _json_loads(resp.content)
+        except Exception:
+            print(f"Failed to decode JSON from {url}")
+            return None
+    print(f"medRxiv API request failed with status {resp.status_code}, url {url}")
+    return None
+
+
+def _compile_terms(terms: list[str]) -> re.Pattern | None:
+    """
+    Builds one pattern over the lowercased terms so an item is matched in a
+    single regex scan instead of one substring scan per term. Callers search
+    lowercased text; that is much faster than re.IGNORECASE on long abstracts.
+    Returns None when there are no terms (everything matches).
+    """
+    if not terms:
         return None
+    # Terms are merged into a character trie so shared prefixes are matched
+    # once, like an Aho-Corasick automaton, instead of once per alternative.
+    trie: dict = {}
+    for term in {t.lower() for t in terms}:
+        node = trie
+        for ch in term:
+            node = node.setdefault(ch, {})
+        node[""] = {}
+    return re.compile(_trie_pattern(trie))
+
+
+def _trie_pattern(node: dict) -> str:
+    branches = [re.escape(ch) + _trie_pattern(child) for ch, child in sorted(node.items()) if ch]
+    if not branches:
+        return ""
+    if "" in node:
+        # A term ends here; longer terms through this node are optional
+        return f"(?:{'|'.join(branches)})?"
+    if len(branches) == 1:
+        return branches[0]
+    return f"(?:{'|'.join(branches)})"
 
 
-def _process_medrxiv_item(item: dict, lower_terms: list[str], wrap_width: int) -> list[dict]:
+def _process_medrxiv_item(item: dict, term_pattern: re.Pattern | None, wrap_width: int) -> list[dict]:
     abstract = (item.get("abstract") or "").strip()
     title = (item.get("title") or "").strip()
+    if term_pattern is not None and not (
+        term_pattern.search(title.lower()) or term_pattern.search(abstract.lower())
+    ):
+        return []
+
     authors_raw = (item.get("authors") or "").strip()
-    authors_list = [a.strip() for a in authors_raw.split(";") if a.strip()]
-    authors = ", ".join(authors_list)
+    authors = ", ".join(a for a in _SEMI_RE.split(authors_raw) if a)
     doi = item.get("doi", "") or ""
     date_str = item.get("date", "") or ""
     published = _safe_date_iso(date_str)
+    paper_id = doi or f"{item.get('server', '')}_{item.get('version', '')}"
 
-    ta_lower = (title + " " + abstract).lower()
-    if len(lower_terms) > 0 and not any(term in ta_lower for term in lower_terms):
-        return []
-
-    wrapped = textwrap.wrap(abstract.replace("\n", " "), width=wrap_width)
+    wrapped = _fast_wrap(abstract, wrap_width)
     rows: list[dict] = []
     for i, chunk in enumerate(wrapped):
         rows.append({
-            "paper_id": doi or f"{item.get('server', '')}_{item.get('version', '')}",
+            "paper_id": paper_id,
             "title": title,
             "authors": authors,
             "published": published,
             "source": "medrxiv",
             "chunk_id": i,
             "text_chunk": chunk,
-            "abstract": abstract,
+            "pdf_url": "",
+            "abstract": abstract if i == 0 else "",
             "doi": doi,
         })
     return rows
@@ -242,22 +571,76 @@ def _process_medrxiv_item(item: dict, lower_terms: list[str], wrap_width: int) -
 def _safe_date_iso(date_str: str) -> str:
     if not date_str:
         return ""
+    # Keyed on the day so full arXiv timestamps share cache entries
+    return _day_iso(date_str[:10]) or date_str
+
+
+@functools.lru_cache(maxsize=512)
+def _day_iso(day: str) -> str | None:
     try:
-        return datetime.fromisoformat(date_str[:10]).date().isoformat()
+        return datetime.fromisoformat(day).date().isoformat()
     except Exception:
-        return date_str
+        return None
 
 
-def build_session(user_agent: str | None = None, total_retries: int = 3, backoff_factor: float = 0.5) -> requests.Session:
+def _fast_wrap(text: str, width: int) -> list[str]:
+    """
+    Splits text into chunks of at most `width` characters, breaking on the
+    last space that fits. Whitespace is collapsed first; a word longer than
+    `width` is split mid-word. A lightweight stand-in for textwrap.wrap.
+    """
+    if width <= 0:
+        raise ValueError(f"invalid width {width!r} (must be > 0)")
+    # str.split() collapses the same whitespace as _WS_RE, several times faster
+    s = " ".join(text.split())
+    n = len(s)
+    if n <= width:
+        return [s] if s else []
+    chunks: list[str] = []
+    i = 0
+    while i < n:
+        j = i + width
+        if j >= n:
+            chunks.append(s[i:])
+            break
+        if s[j] != " ":
+            k = s.rfind(" ", i, j)
+            if k > i:
+                j = k
+        chunks.append(s[i:j])
+        # Skip the space we broke on, if any
+        i = j + 1 if s[j] == " " else j
+    return chunks
+
+
+def build_session(user_agent: str | None = None,
+                  total_retries: int = 3,
+                  backoff_factor: float = 0.5,
+                  pool_maxsize: int = 20) -> requests.Session:
+    """
+    Builds the HTTP session used by every source. Retries live here, in the
+    urllib3 adapter: exponential backoff (backoff_factor * 2**n, capped at
+    RETRY_BACKOFF_MAX seconds) plus random jitter, honouring Retry-After.
+    The cap and jitter need urllib3 2.x; on 1.26 its default cap is used
+    without jitter.
+    `pool_maxsize` is the number of kept-alive connections per host; size it
+    to the number of concurrent requests so none are opened and discarded.
+    """
     session = requests.Session()
-    retry = Retry(
+    retry_kwargs = dict(
         total=total_retries,
         backoff_factor=backoff_factor,
-        status_forcelist=[403, 429, 502, 503, 504],
+        status_forcelist=[403, 429, 500, 502, 503, 504],
         allowed_methods=["GET"],
         raise_on_status=False,
+        respect_retry_after_header=True,
     )
-    adapter = HTTPAdapter(max_retries=retry)
+    try:
+        retry = Retry(backoff_max=RETRY_BACKOFF_MAX, backoff_jitter=backoff_factor, **retry_kwargs)
+    except TypeError:
+        # urllib3 1.26 has neither keyword
+        retry = Retry(**retry_kwargs)
+    adapter = HTTPAdapter(pool_connections=10, pool_maxsize=pool_maxsize, max_retries=retry)
     session.mount("http://", adapter)
     session.mount("https://", adapter)
     if user_agent:
@@ -266,21 +649,54 @@ def build_session(user_agent: str | None = None, total_retries: int = 3, backoff
     return session
 
 
+def _get_session() -> requests.Session:
+    """
+    Returns the module-level session, building it on first use so every
+    request without an explicit session still shares one connection pool.
+    """
+    global _SESSION
+    with _SESSION_LOCK:
+        if _SESSION is None:
+            _SESSION = build_session()
+        return _SESSION
+
+
+def _paper_key(doi: str, fallback_id: str) -> str:
+    """
+    Canonical paper key shared by all sources: the lower-cased DOI when
+    there is one, otherwise the source's own paper id.
+    """
+    doi = doi.strip().lower()
+    return f"doi:{doi}" if doi else fallback_id
+
+
+def _already_seen(seen_papers: set[str] | None, key: str) -> bool:
+    return seen_papers is not None and bool(key) and key in seen_papers
+
+
+def _mark_seen(seen_papers: set[str] | None, key: str, rows: list):
+    # Only papers that actually produced rows claim their key
+    if seen_papers is not None and key and rows:
+        seen_papers.add(key)
+
+
 def dedupe_rows(rows: list[dict]) -> list[dict]:
-    seen: set[tuple] = set()
-    out: list[dict] = []
+    return list(iter_unique_rows(rows))
+
+
+def iter_unique_rows(rows: Iterable[dict]) -> Iterator[dict]:
+    """
+    Streaming form of dedupe_rows: yields each row the first time its key
+    is seen, holding only the keys in memory. A chunk is identified by its
+    paper (DOI or paper_id) and chunk_id, so chunk text is never hashed.
+    """
+    seen: set[str] = set()
     for r in rows:
-        key = (
-            (r.get("doi") or r.get("paper_id") or ""),
-            r.get("published", ""),
-            r.get("chunk_id"),
-            r.get("text_chunk", ""),
-        )
+        key = f"{r.get('doi') or r.get('paper_id') or ''}#{r.get('chunk_id')}"
         if key in seen:
             continue
         seen.add(key)
-        out.append(r)
-    return out
+        yield r
 
 def query_europe_pmc_papers(
     terms: list[str],
@@ -291,18 +707,21 @@ def query_europe_pmc_papers(
     timeout_seconds: float = 15.0,
     wrap_width: int = 500,
     session: requests.Session | None = None,
-):
+    seen_papers: set[str] | None = None,
+) -> Iterator[dict]:
     """
     Query Europe PMC for recent articles/preprints matching any search term.
     Filters by FIRST_PDATE within the last `days_back` days and requires abstracts.
+    Items whose paper key is already in `seen_papers` are skipped before any
+    detail/fulltext lookups or chunking.
     """
-    collected: list[dict] = []
     if not terms:
-        return collected
+        return
 
-    http = session or requests
+    http = session or _get_session()
     query = _epmc_build_query(terms, days_back)
     cursor = "*"
+    collected = 0
 
     while True:
         page = _epmc_fetch_page(http, base_url, query, cursor, page_size, timeout_seconds)
@@ -313,22 +732,25 @@ def query_europe_pmc_papers(
             break
 
         for item in results:
+            key = _paper_key(item.get("doi") or "", f"EPMC:{item.get('source') or ''}:{item.get('id') or ''}")
+            if _already_seen(seen_papers, key):
+                continue
             rows = _epmc_process_item(item, http, base_url, timeout_seconds, wrap_width)
+            _mark_seen(seen_papers, key, rows)
             for r in rows:
-                collected.append(r)
-                if len(collected) >= max_results:
+                yield r
+                collected += 1
+                if collected >= max_results:
                     break
-            if len(collected) >= max_results:
+            if collected >= max_results:
                 break
 
-        if len(collected) >= max_results:
+        if collected >= max_results:
             break
         if not next_cursor or next_cursor == cursor:
             break
         cursor = next_cursor
 
-    return collected
-
 
 def _epmc_build_query(terms: list[str], days_back: int) -> str:
     start_date, end_date = _interval_dates(days_back)
@@ -362,7 +784,7 @@ def _epmc_fetch_page(
         print(f"Europe PMC API request failed with status {resp.status_code}, url {resp.url}")
         return None
     try:
-        data = resp.json()
+        data = _json_loads(resp.content)
     except Exception:
         print("Europe PMC: failed to decode JSON")
         return None
@@ -387,7 +809,7 @@ def _epmc_process_item(
     if not abstract and (item.get("source") == "PMC" or (item.get("inPMC") or "N") == "Y" or item.get("pmcid")):
         fulltext = _epmc_fetch_fulltext(http, base_url, item.get("source"), item.get("id"), timeout_seconds)
         if fulltext:
-            abstract = fulltext[:2000]
+            abstract = fulltext[:FULLTEXT_MAX_CHARS]
 
     if not abstract:
         return []
@@ -399,7 +821,7 @@ def _epmc_process_item(
     src_code = (item.get("source") or "").strip()
     paper_id = f"EPMC:{src_code}:{internal_id}" if internal_id or src_code else (doi or "")
 
-    wrapped = textwrap.wrap(abstract.replace("\n", " "), width=wrap_width)
+    wrapped = _fast_wrap(abstract, wrap_width)
     rows: list[dict] = []
     for i, chunk in enumerate(wrapped):
         rows.append({
@@ -410,7 +832,8 @@ def _epmc_process_item(
             "source": "europe_pmc",
             "chunk_id": i,
             "text_chunk": chunk,
-            "abstract": abstract,
+            "pdf_url": "",
+            "abstract": abstract if i == 0 else "",
             "doi": doi,
         })
     return rows
@@ -427,44 +850,72 @@ def _epmc_fetch_detail(http, base_url: str, source: str | None, ext_id: str | No
     if resp.status_code != STATUS_OK:
         return None
     try:
-        data = resp.json()
+        data = _json_loads(resp.content)
     except Exception:
         return None
     return data.get("result") or None
 
 
-def _epmc_fetch_fulltext(http, base_url: str, source: str | None, ext_id: str | None, timeout_seconds: float) -> str | None:
+def _epmc_fetch_fulltext(
+    http,
+    base_url: str,
+    source: str | None,
+    ext_id: str | None,
+    timeout_seconds: float,
+    max_chars: int = FULLTEXT_MAX_CHARS,
+) -> str | None:
     if source != "PMC" or not ext_id:
         return None
     url = f"{base_url}/{source}/{ext_id}/fullTextXML"
     try:
-        resp = http.get(url, timeout=timeout_seconds)
+        resp = http.get(url, timeout=timeout_seconds, stream=True)
     except Exception:
         return None
-    if resp.status_code != STATUS_OK:
-        return None
-    xml_text = resp.text
-    try:
-        import xml.etree.ElementTree as ET
-        root = ET.fromstring(xml_text)
-        # Extract text from abstract and body paragraphs
-        parts: list[str] = []
-        for tag in ["abstract", "body"]:
-            for elem in root.iter(tag):
-                for p in elem.iter("p"):
-                    text = "".join(p.itertext()).strip()
+    with resp:
+        if resp.status_code != STATUS_OK:
+            return None
+        try:
+            # Stream-parse the body and stop once `max_chars` of abstract/body
+            # paragraph text is collected; the caller truncates to that anyway.
+            resp.raw.decode_content = True
+            parts: list[str] = []
+            total = 0
+            depth = 0
+            for event, elem in ET.iterparse(resp.raw, events=("start", "end")):
+                if elem.tag in ("abstract", "body"):
+                    depth += 1 if event == "start" else -1
+                elif event == "end" and elem.tag == "p" and depth:
+                    text = "".join(elem.itertext()).strip()
                     if text:
                         parts.append(text)
-        return "\n\n".join(parts)
-    except Exception:
-        return None
+                        total += len(text)
+                    elem.clear()
+                    if total >= max_chars:
+                        break
+                elif event == "end" and not depth:
+                    # Nothing outside abstract/body is needed; keep memory flat
+                    elem.clear()
+            return "\n\n".join(parts)
+        except Exception:
+            return None
+
+
+def _positive_int(value: str) -> int:
+    number = int(value)
+    if number <= 0:
+        raise argparse.ArgumentTypeError(f"must be a positive integer, got {value}")
+    return number
+
 
 def download_papers():
     parser = argparse.ArgumentParser()
     parser.add_argument('--terms-dir', default=PACKAGE, help="Import path to the package containing base64-encoded search term .txt files.")
     parser.add_argument('--save-folder', default="ai_womens_health_paper_chunks/", help="Output folder for combined paper chunks (source-agnostic).")
     parser.add_argument('--max-results', type=int, default=500, help='Maximum number of chunks to collect per source.')
-    parser.add_argument('--wrap-width', type=int, default=500, help='Character width for chunk wrapping of abstracts/summaries.')
+    parser.add_argument('--wrap-width', type=_positive_int, default=500, help='Character width for chunk wrapping of abstracts/summaries.')
+    parser.add_argument('--max-workers', type=int, default=4, help='Number of topics downloaded concurrently. Keep small to stay polite to the APIs.')
+    parser.add_argument('--compress', choices=sorted(COMPRESSION_SUFFIXES), default="none", help='Compress the output CSVs (gzip, or zstd via the zstandard package).')
+    parser.add_argument('--incremental', action='store_true', help=f'Only fetch papers published since each source\'s last successful run (tracked in {STATE_FILE} in the save folder) and merge them into the existing CSVs.')
     # Source toggles (default: all enabled)
     parser.add_argument('--no-arxiv', dest='use_arxiv', action='store_false', help='Enable querying arXiv (default).')
     parser.add_argument('--no-medrxiv', dest='use_medrxiv', action='store_false', help='Enable querying medRxiv (default).')
@@ -474,9 +925,10 @@ def download_papers():
     parser.add_argument('--medrxiv-days-back', type=int, default=7, help='Number of past days to query from medRxiv API.')
     parser.add_argument('--medrxiv-base-url', default="https://api.biorxiv.org", help='Base URL for the medRxiv/BioRxiv public API.')
     parser.add_argument('--medrxiv-user-agent', default="my-app/1.0 (mailto:you@example.com)", help='Custom User-Agent including contact info. Strongly recommended to avoid 403 errors.')
-    parser.add_argument('--medrxiv-retries', type=int, default=3, help='Retries for transient HTTP errors (403/429/5xx).')
+    parser.add_argument('--medrxiv-retries', type=int, default=3, help='Retries for transient HTTP errors (403/429/5xx), applied to all sources.')
     parser.add_argument('--medrxiv-backoff-seconds', type=float, default=1.5, help='Base backoff seconds between retries.')
     parser.add_argument('--medrxiv-timeout-seconds', type=float, default=15.0, help='Timeout for medRxiv HTTP requests.')
+    parser.add_argument('--medrxiv-prefetch-pages', type=int, default=4, help='medRxiv pages fetched concurrently per topic.')
     # Europe PMC controls
     parser.add_argument('--epmc-base-url', default='https://www.ebi.ac.uk/europepmc/webservices/rest', help='Base URL for the Europe PMC REST API.')
     parser.add_argument('--epmc-page-size', type=int, default=100, help='Page size for Europe PMC search.')
@@ -488,42 +940,122 @@ def download_papers():
 
     all_terms = load_all_search_terms(args.terms_dir)
 
-    # Build a shared HTTP session for medRxiv to reuse connections
-    session = build_session(user_agent=args.medrxiv_user_agent, total_retries=args.medrxiv_retries, backoff_factor=max(0.1, args.medrxiv_backoff_seconds/3))
+    # Build a shared HTTP session for all sources to reuse connections. Its
+    # per-host pool is sized for the busiest host: every topic worker may
+    # have a full set of medRxiv page fetches in flight at once.
+    workers = max(1, min(args.max_workers, len(all_terms)))
+    session = build_session(
+        user_agent=args.medrxiv_user_agent,
+        total_retries=args.medrxiv_retries,
+        backoff_factor=max(0.1, args.medrxiv_backoff_seconds/3),
+        pool_maxsize=max(10, workers * max(1, args.medrxiv_prefetch_pages)),
+    )
 
-    for doc, terms in all_terms.items():
-        save_file_name = dir / f"{doc}.{SAVE_EXT}"
+    state_path = dir / STATE_FILE
+    state = _load_harvest_state(state_path)
+    harvest_date = datetime.now(timezone.utc).date()
+    # Only sources that ran have their harvest date advanced
+    enabled = [source for source, on in zip(SOURCES, (args.use_arxiv, args.use_medrxiv, args.use_epmc)) if on]
+
+    failed: list[str] = []
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {}
+        for doc, terms in all_terms.items():
+            since = {source: date.fromisoformat(d) for source, d in state.get(doc, {}).items()} if args.incremental else None
+            futures[executor.submit(_run_topic, doc, terms, args, dir / f"{doc}.{SAVE_EXT}{COMPRESSION_SUFFIXES[args.compress]}", session, since)] = doc
+        # Each topic saves its own CSV as soon as it finishes
+        for future in as_completed(futures):
+            if future.result():
+                state.setdefault(futures[future], {}).update(dict.fromkeys(enabled, harvest_date.isoformat()))
+            else:
+                failed.append(futures[future])
+    _save_harvest_state(state_path, state)
+    if failed:
+        print(f"Finished with errors for {len(failed)}/{len(all_terms)} topics: {', '.join(sorted(failed))}")
+
+
+def _run_topic(
+    doc: str,
+    terms: list[str],
+    args: argparse.Namespace,
+    save_file_name: Path,
+    session: requests.Session,
+    since: dict[str, date] | None = None,
+) -> bool:
+    """
+    Downloads and saves the chunks for a single topic. Topics are independent
+    (one CSV each), so download_papers runs them concurrently.
+    With `since` (an incremental run: source -> last harvest date), each source
+    only fetches papers from its own date onwards, and the results are merged
+    with the rows already saved for the topic. Sources without a date are
+    harvested in full.
+    Returns False if the topic failed.
+    """
+    # Papers already collected from an earlier source are skipped by later ones
+    seen_papers: set[str] = set()
+    previous_rows: Iterable[dict] = []
+    since = dict(since or {})
+    if since and not save_file_name.exists():
+        since = {}
+    if since:
         try:
-            arxiv_data = query_arxiv_papers(terms, max_results=args.max_results, wrap_width=args.wrap_width) if args.use_arxiv else []
-            medrxiv_data = query_medrxiv_papers(
-                terms,
-                server=args.medrxiv_server,
-                days_back=args.medrxiv_days_back,
-                max_results=args.max_results,
-                base_url=args.medrxiv_base_url,
-                user_agent=args.medrxiv_user_agent,
-                retries=args.medrxiv_retries,
-                backoff_seconds=args.medrxiv_backoff_seconds,
-                timeout_seconds=args.medrxiv_timeout_seconds,
-                wrap_width=args.wrap_width,
-                session=session,
-            ) if args.use_medrxiv else []
-            epmc_data = query_europe_pmc_papers(
-                terms,
-                days_back=args.medrxiv_days_back,
-                max_results=args.max_results,
-                page_size=args.epmc_page_size,
-                base_url=args.epmc_base_url,
-                timeout_seconds=args.epmc_timeout_seconds,
-                wrap_width=args.wrap_width,
-                session=session,
-            ) if args.use_epmc else []
-            combined = dedupe_rows((arxiv_data or []) + (medrxiv_data or []) + (epmc_data or []))
-            save_collected_data(combined, save_file_name)
-        except arxiv.UnexpectedEmptyPageError:
-            print(f"Page unexpectedly empty error for topic: {doc}.")
+            seen_papers.update(_paper_key(r.get("doi") or "", r.get("paper_id") or "") for r in read_collected_data(save_file_name))
         except Exception as e:
-            print(f"Error downloading papers for topic '{doc}': {e}")
+            # An unreadable earlier file can't be merged; replace it with a full harvest
+            print(f"Could not read saved chunks for topic '{doc}' ({e}); doing a full harvest")
+            seen_papers.clear()
+            since = {}
+        else:
+            previous_rows = read_collected_data(save_file_name)
+
+    today = datetime.now(timezone.utc).date()
+
+    def days_back_for(source: str) -> int:
+        if source not in since:
+            return args.medrxiv_days_back
+        return min(args.medrxiv_days_back, max(1, (today - since[source]).days))
+    try:
+        # Sources are lazy generators chained in priority order, so rows are
+        # written as they arrive and only dedupe keys stay in memory.
+        arxiv_rows = query_arxiv_papers(
+            terms,
+            max_results=args.max_results,
+            wrap_width=args.wrap_width,
+            session=session,
+            seen_papers=seen_papers,
+            submitted_since=since.get("arxiv"),
+        ) if args.use_arxiv else []
+        medrxiv_rows = query_medrxiv_papers(
+            terms,
+            server=args.medrxiv_server,
+            days_back=days_back_for("medrxiv"),
+            max_results=args.max_results,
+            base_url=args.medrxiv_base_url,
+            user_agent=args.medrxiv_user_agent,
+            timeout_seconds=args.medrxiv_timeout_seconds,
+            wrap_width=args.wrap_width,
+            session=session,
+            seen_papers=seen_papers,
+            prefetch_pages=args.medrxiv_prefetch_pages,
+        ) if args.use_medrxiv else []
+        epmc_rows = query_europe_pmc_papers(
+            terms,
+            days_back=days_back_for("epmc"),
+            max_results=args.max_results,
+            page_size=args.epmc_page_size,
+            base_url=args.epmc_base_url,
+            timeout_seconds=args.epmc_timeout_seconds,
+            wrap_width=args.wrap_width,
+            session=session,
+            seen_papers=seen_papers,
+        ) if args.use_epmc else []
+        # New rows come first; previously saved rows (incremental runs) follow
+        combined = iter_unique_rows(itertools.chain(arxiv_rows, medrxiv_rows, epmc_rows, previous_rows))
+        stream_collected_data(combined, save_file_name)
+    except Exception as e:
+        print(f"Error downloading papers for topic '{doc}': {e}")
+        return False
+    return True
 
 if __name__ == "__main__":
     download_papers()
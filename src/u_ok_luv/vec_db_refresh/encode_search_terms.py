@@ -6,6 +6,8 @@ be decoded.
 """
 import argparse
 import base64
+import functools
+import os
 import pandas as pd
 
 def encode_search_terms(csv: str):
@@ -13,7 +15,7 @@ def encode_search_terms(csv: str):
     Encodes the items in a single column csv using base64.
     """
     c = pd.read_csv(csv)
-    c['Term'] = c['Term'].map(lambda t: base64.b64encode(t.encode('utf8')).decode('utf8'))
+    c['Term'] = [base64.b64encode(t.encode('utf8')).decode('ascii') for t in c['Term'].tolist()]
     c.to_csv(csv, index=False)
     return c['Term']
 
@@ -22,7 +24,7 @@ def decode_search_terms(csv: str):
     Encodes the items in a single column csv using base64.
     """
     c = pd.read_csv(csv)
-    c['Term'] = c['Term'].map(lambda t: base64.b64decode(t.encode('utf8')).decode('utf8'))
+    c['Term'] = [base64.b64decode(t).decode('utf8') for t in c['Term'].tolist()]
     c.to_csv(csv, index=False)
     return c['Term']
 
@@ -30,9 +32,23 @@ def read_search_terms(csv: str):
     """
     Decodes the items in a single column csv using base64 without editing the stored encoded terms.
     Converts terms to all lowercase.
+    Decoded terms are cached per file and modification time, so repeated reads within a
+    process skip the disk and decode work but still pick up edits to the file.
     """
+    try:
+        mtime = os.stat(csv).st_mtime_ns
+    except (OSError, TypeError):
+        # Not a path on disk (e.g. a file-like object): read it uncached
+        return pd.Series(_decode_terms(csv), name='Term', dtype=object)
+    return pd.Series(_read_search_terms_cached(str(csv), mtime), name='Term', dtype=object)
+
+@functools.lru_cache(maxsize=128)
+def _read_search_terms_cached(csv: str, mtime: int) -> tuple[str, ...]:
+    return _decode_terms(csv)
+
+def _decode_terms(csv) -> tuple[str, ...]:
     c = pd.read_csv(csv)
-    return c['Term'].map(lambda t: base64.b64decode(t.encode('utf8')).decode('utf8').lower())
+    return tuple(base64.b64decode(t).decode('utf8').lower() for t in c['Term'].tolist())
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser()